@@ -19,20 +19,43 @@ Ejemplos:
   python deploy.py test --force
 """
 
-import argparse
-import keyword
+import functools
+import itertools
 import os
-import platform
+import re
 import shutil
 import subprocess
 import sys
+import threading
 from pathlib import Path
+from types import SimpleNamespace
 
 if sys.version_info < (3, 8):
     sys.exit("❌ Requiere Python 3.8+")
 
+IS_WINDOWS = sys.platform.startswith("win")
+
+# Resuelto una vez: la plataforma no cambia durante la ejecución
+if IS_WINDOWS:
+    PYTHON_CANDIDATES = ("python", "python3")
+    ACTIVATE = ".venv\\Scripts\\activate"
+else:
+    PYTHON_CANDIDATES = ("python3", "python")
+    ACTIVATE = "source .venv/bin/activate"
+
 LOCK_FILE = ".deploy.lock"
 
+# venv y git se ejecutan en paralelo: serializa su salida por consola
+PRINT_LOCK = threading.Lock()
+
+# Sanitización de nombres: espacios y guiones → "_" en una sola pasada
+NAME_TABLE = str.maketrans(" -", "__")
+
+# Errores conocidos de hardlinks:
+# - Windows: "os error 396", "os error 1314"
+# - General: "hardlink", "link mode"
+HARDLINK_ERROR = re.compile(r"hardlink|link|396|1314|cross-device")
+
 BACKENDS = {
     "setuptools": {
         "requires": '["setuptools>=61.0"]',
@@ -45,20 +68,126 @@ BACKENDS = {
 }
 
 
+# ----------------------------------------------------------------------
+# PLANTILLAS
+# ----------------------------------------------------------------------
+
+# Plantillas fijas: ya codificadas, se escriben tal cual
+INIT_PY = b'__version__ = "0.1.0"\n'
+
+GITIGNORE = (
+    b"# Python\n"
+    b"__pycache__/\n"
+    b"*.py[cod]\n"
+    b"*.egg-info/\n"
+    b"\n"
+    b"# Entorno virtual\n"
+    b".venv/\n"
+    b"venv/\n"
+    b"\n"
+    b".env"
+    b"env"
+    b"\n"
+    b"# Build\n"
+    b"dist/\n"
+    b"build/\n"
+    b"\n"
+    b"# IDEs\n"
+    b".vscode/\n"
+    b".idea/\n"
+    b"*.swp\n"
+    b"\n"
+    b"# OS\n"
+    b".DS_Store\n"
+    b"Thumbs.db\n"
+    b"\n"
+    b"# Deploy\n"
+    b".deploy.lock\n"
+)
+
+EDITORCONFIG = (
+    b"root = true\n"
+    b"\n"
+    b"[*]\n"
+    b"indent_style = space\n"
+    b"indent_size = 4\n"
+    b"end_of_line = lf\n"
+    b"charset = utf-8\n"
+    b"trim_trailing_whitespace = true\n"
+    b"insert_final_newline = true\n"
+    b"\n"
+    b"[*.{yml,yaml}]\n"
+    b"indent_size = 2\n"
+    b"\n"
+    b"[Makefile]\n"
+    b"indent_style = tab\n"
+)
+
+# Plantillas que dependen del nombre/backend (str.format)
+MAIN_PY = (
+    "def main():\n"
+    "    print('Hello from {name}!')\n"
+    "\n"
+    "if __name__ == '__main__':\n"
+    "    main()\n"
+)
+
+PYPROJECT = (
+    "[project]\n"
+    'name = "{name}"\n'
+    'version = "0.1.0"\n'
+    'readme = "README.md"\n'
+    'requires-python = ">=3.8"\n'
+    "dependencies = []\n"
+    "\n"
+    "[project.scripts]\n"
+    '{name} = "{name}.main:main"\n'
+    "\n"
+    "[build-system]\n"
+    "requires = {requires}\n"
+    'build-backend = "{build_backend}"\n'
+)
+
+README = (
+    "# {name}\n"
+    "\n"
+    "Proyecto generado con deploy.py\n"
+    "\n"
+    "## Instalación\n"
+    "\n"
+    "```bash\n"
+    "# Activar entorno virtual\n"
+    "source .venv/bin/activate  # Linux/Mac\n"
+    ".venv\\Scripts\\activate     # Windows\n"
+    "\n"
+    "# Instalar proyecto en modo desarrollo\n"
+    "pip install -e .\n"
+    "```\n"
+)
+
+
 # ----------------------------------------------------------------------
 # UTILIDADES
 # ----------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=None)
+def which(name):
+    """shutil.which cacheado: cada herramienta se busca en PATH una sola vez."""
+    return shutil.which(name)
+
+
+def log(msg):
+    """Escribe una línea protegida por PRINT_LOCK (no mezcla hilos)."""
+    # Una sola escritura (print hace dos: texto y salto de línea)
+    with PRINT_LOCK:
+        sys.stdout.write(f"{msg}\n")
+
+
 def find_python():
     """Busca Python en PATH."""
-    if platform.system() == "Windows":
-        candidates = ["python", "python3"]
-    else:
-        candidates = ["python3", "python"]
-
-    for cmd in candidates:
-        if path := shutil.which(cmd):
+    for cmd in PYTHON_CANDIDATES:
+        if path := which(cmd):
             print(f"✅ Python: {path}")
             return path
 
@@ -66,17 +195,52 @@ def find_python():
 
 
 def run(cmd, cwd=None, env=None):
-    """Ejecuta comando. Falla si hay error."""
-    print(f"⚙️ {' '.join(cmd)}")
+    """
+    Ejecuta comando. Falla si hay error.
+
+    Espera en tramos cortos: en Windows un wait() sin timeout no atiende
+    Ctrl+C hasta que el proceso termina. Si se interrumpe, se termina el
+    proceso hijo antes de propagar la excepción (rollback incluido).
+    """
+    log(f"⚙️ {' '.join(cmd)}")
+    # Comandos no interactivos: stdin cerrado (sin esperas ni sondeo de TTY)
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdin=subprocess.DEVNULL)
     try:
-        subprocess.run(cmd, check=True, cwd=cwd, env=env)
-    except subprocess.CalledProcessError as e:
+        while True:
+            try:
+                returncode = proc.wait(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+    except BaseException:
+        proc.terminate()
+        proc.wait()
+        raise
+
+    if returncode:
+        e = subprocess.CalledProcessError(returncode, cmd)
         sys.exit(f"❌  Error: {e}")
 
 
+def peek_dir(root):
+    """
+    Nombres de, como mucho, las 2 primeras entradas de root ([] si no existe).
+
+    Basta para distinguir vacía / solo lockfile / con contenido sin recorrer
+    carpetas grandes.
+    """
+    try:
+        with os.scandir(root) as it:
+            return [entry.name for entry in itertools.islice(it, 2)]
+    except FileNotFoundError:
+        return []
+
+
 def clean_name(name):
     """Sanitiza nombre de paquete Python."""
-    clean = name.replace(" ", "_").replace("-", "_").lower()
+    import keyword
+
+    clean = name.translate(NAME_TABLE).lower()
     if not clean.isidentifier() or keyword.iskeyword(clean):
         sys.exit(f"❌  '{clean}' no es válido (evita números/palabras reservadas).")
     return clean
@@ -94,184 +258,155 @@ def create_venv(root, python_exe, version=None):
     EAFP: Intenta operación optimizada (hardlinks). Si falla por problemas
     de filesystem (OneDrive, Dropbox...), reintenta con copy mode.
     """
-    if not shutil.which("uv"):
-        print("✅ Creando venv con Python estándar...")
+    if not which("uv"):
+        log("✅ Creando venv con Python estándar...")
         if version:
-            print("⚠️ --python requiere uv. Ignorando.")
+            log("⚠️ --python requiere uv. Ignorando.")
         run([python_exe, "-m", "venv", ".venv"], cwd=root)
         return True
 
-    print(f"✅ Creando venv con uv{f' ({version})' if version else ''}...")
+    log(f"✅ Creando venv con uv{f' ({version})' if version else ''}...")
     cmd = ["uv", "venv", ".venv"]
     if version:
         cmd.extend(["--python", version])
     else:
-        cmd.extend(["--python", python_exe])
+        # Intérprete ya validado: sin descubrimiento ni descargas de uv
+        cmd.extend(["--python-preference", "only-system", "--python", python_exe])
 
     # EAFP: Intentar operación optimizada
-    print(f"⚙️ {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=root, capture_output=True, text=True)
+    log(f"⚙️ {' '.join(cmd)}")
+    # Solo stderr interesa (y solo si falla): stdout se descarta, sin decodificar
+    result = subprocess.run(
+        cmd,
+        cwd=root,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
 
     if result.returncode == 0:
         return True  # Éxito con hardlinks
 
     # Analizar el error
-    error_output = (result.stderr + result.stdout).lower()
-
-    # Errores conocidos de hardlinks:
-    # - Windows: "os error 396", "os error 1314"
-    # - General: "hardlink", "link mode"
-    is_hardlink_error = any(
-        keyword in error_output
-        for keyword in ["hardlink", "link", "396", "1314", "cross-device"]
-    )
+    stderr = result.stderr.decode("utf-8", errors="replace")
+    error_output = stderr.lower()
 
-    if is_hardlink_error:
-        print(" ⚠️ Problema de hardlinks detectado (OneDrive, Dropbox...")
-        print(" ✅ Reintentando con copy mode...")
+    if HARDLINK_ERROR.search(error_output):
+        log(" ⚠️ Problema de hardlinks detectado (OneDrive, Dropbox...")
+        log(" ✅ Reintentando con copy mode...")
 
-        env = os.environ.copy()
-        env["UV_LINK_MODE"] = "copy"
-        run(cmd, cwd=root, env=env)
+        run(cmd, cwd=root, env={**os.environ, "UV_LINK_MODE": "copy"})
         return False
     else:
         # Otro tipo de error, mostrar y fallar
-        print("\n❌ Error creando venv:")
-        print(result.stderr)
+        log("\n❌ Error creando venv:")
+        log(stderr)
         sys.exit(1)
 
 
-def create_files(root, name, backend):
-    """Genera estructura src-layout y archivos de configuración."""
-    backend_conf = BACKENDS[backend]
-
-    # Crear estructura de carpetas
-    (root / "src" / name).mkdir(parents=True, exist_ok=True)
+def create_files(root, name, backend, created):
+    """
+    Genera estructura src-layout y archivos de configuración.
 
-    # src/<name>/__init__.py
-    (root / "src" / name / "__init__.py").write_text(
-        '__version__ = "0.1.0"\n', encoding="utf-8"
-    )
+    Registra en `created` cada carpeta/archivo creado, para el rollback.
+    """
+    backend_conf = BACKENDS[backend]
 
-    # src/<name>/main.py
-    (root / "src" / name / "main.py").write_text(
-        f"def main():\n"
-        f"    print('Hello from {name}!')\n"
-        f"\n"
-        f"if __name__ == '__main__':\n"
-        f"    main()\n",
-        encoding="utf-8",
-    )
+    # Rutas como str planos: se convierte root una sola vez
+    root = os.fspath(root)
+    src_dir = os.path.join(root, "src")
+    src = os.path.join(src_dir, name)
 
-    # pyproject.toml
-    (root / "pyproject.toml").write_text(
-        f"[project]\n"
-        f'name = "{name}"\n'
-        f'version = "0.1.0"\n'
-        f'readme = "README.md"\n'
-        f'requires-python = ">=3.8"\n'
-        f"dependencies = []\n"
-        f"\n"
-        f"[project.scripts]\n"
-        f'{name} = "{name}.main:main"\n'
-        f"\n"
-        f"[build-system]\n"
-        f"requires = {backend_conf['requires']}\n"
-        f'build-backend = "{backend_conf["build-backend"]}"\n',
-        encoding="utf-8",
-    )
+    # Crear estructura de carpetas (una sola llamada)
+    os.makedirs(src, exist_ok=True)
+    created.extend((src_dir, src))
 
-    # README.md
-    (root / "README.md").write_text(
-        f"# {name}\n"
-        f"\n"
-        f"Proyecto generado con deploy.py\n"
-        f"\n"
-        f"## Instalación\n"
-        f"\n"
-        f"```bash\n"
-        f"# Activar entorno virtual\n"
-        f"source .venv/bin/activate  # Linux/Mac\n"
-        f".venv\\Scripts\\activate     # Windows\n"
-        f"\n"
-        f"# Instalar proyecto en modo desarrollo\n"
-        f"pip install -e .\n"
-        f"```\n",
-        encoding="utf-8",
+    pyproject = PYPROJECT.format(
+        name=name,
+        requires=backend_conf["requires"],
+        build_backend=backend_conf["build-backend"],
     )
 
-    # .gitignore
-    (root / ".gitignore").write_text(
-        "# Python\n"
-        "__pycache__/\n"
-        "*.py[cod]\n"
-        "*.egg-info/\n"
-        "\n"
-        "# Entorno virtual\n"
-        ".venv/\n"
-        "venv/\n"
-        "\n"
-        ".env"
-        "env"
-        "\n"
-        "# Build\n"
-        "dist/\n"
-        "build/\n"
-        "\n"
-        "# IDEs\n"
-        ".vscode/\n"
-        ".idea/\n"
-        "*.swp\n"
-        "\n"
-        "# OS\n"
-        ".DS_Store\n"
-        "Thumbs.db\n"
-        "\n"
-        "# Deploy\n"
-        ".deploy.lock\n",
-        encoding="utf-8",
-    )
+    files = [
+        (os.path.join(src, "__init__.py"), INIT_PY),
+        (os.path.join(src, "main.py"), MAIN_PY.format(name=name).encode("utf-8")),
+        (os.path.join(root, "pyproject.toml"), pyproject.encode("utf-8")),
+        (os.path.join(root, "README.md"), README.format(name=name).encode("utf-8")),
+        (os.path.join(root, ".gitignore"), GITIGNORE),
+        (os.path.join(root, ".editorconfig"), EDITORCONFIG),
+    ]
+
+    # Escritura en una sola pasada con descriptores crudos (sin objetos de
+    # fichero ni fsync). O_BINARY en Windows evita traducir \n → \r\n
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    for path, data in files:
+        fd = os.open(path, flags, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        created.append(path)
 
 
 def init_git(root):
     """Inicializa Git si está disponible. Tolerante a fallos."""
-    if not shutil.which("git"):
+    if not which("git"):
         return
 
-    print("✅ Inicializando Git...")
+    log("✅ Inicializando Git...")
 
     try:
         run(["git", "init", "-b", "main"], cwd=root)
+        # index v4 + untracked cache: status/add más rápidos según crezca el repo
+        run(["git", "config", "feature.manyFiles", "true"], cwd=root)
         run(["git", "add", "."], cwd=root)
-        run(["git", "commit", "-m", "Initial commit"], cwd=root)
+        # Sin mantenimiento automático tras el commit: evita otro proceso git
+        no_maintenance = ["-c", "maintenance.auto=false", "-c", "gc.auto=0"]
+        run(["git", *no_maintenance, "commit", "-m", "Initial commit"], cwd=root)
     except SystemExit:
-        print(" ⚠️ Git incompleto (¿falta user.email o .git ya existe?). Continuando...")
+        log(" ⚠️ Git incompleto (¿falta user.email o .git ya existe?). Continuando...")
 
 
 def show_next_steps(root, hardlink):
-    """Muestra instrucciones finales al usuario."""
-    if platform.system() == "Windows":
-        activate = ".venv\\Scripts\\activate"
-    else:
-        activate = "source .venv/bin/activate"
-
-    print(f"✅ Proyecto creado: {root.name}\n")
-    print("✨ Siguientes pasos:\n")
-    print(f"   cd {root.name}")
-    print(f"   {activate}")
-    if shutil.which("uv"):
+    """Muestra instrucciones finales al usuario (en una sola escritura)."""
+    if which("uv"):
         if hardlink:
-            print("   uv pip install -e .")
+            install = "uv pip install -e ."
         else:
-            print("   uv pip install -e . --link-mode=copy")
+            install = "uv pip install -e . --link-mode=copy"
     else:
-        print("   pip install -e .")
-    print(f"   {root.name}\n")
+        install = "pip install -e ."
+
+    sys.stdout.write(
+        f"✅ Proyecto creado: {root.name}\n\n"
+        f"✨ Siguientes pasos:\n\n"
+        f"   cd {root.name}\n"
+        f"   {ACTIVATE}\n"
+        f"   {install}\n"
+        f"   {root.name}\n\n"
+    )
 
 
-def clean(flag_rollback, root):
+def clean(flag_rollback, root, created):
+    """
+    Deshace una instalación incompleta.
+
+    EAFP: Borra solo lo registrado por create_files. Si queda algo más
+    (.venv, .git...), root.rmdir() falla y se recurre a shutil.rmtree.
+    """
     if flag_rollback and root.exists():
         print("ℹ️ Limpiando instalación incompleta...")
+        try:
+            for path in reversed(created):
+                if os.path.isdir(path):
+                    os.rmdir(path)
+                else:
+                    os.unlink(path)
+            root.rmdir()
+            return
+        except OSError:
+            pass
+
         try:
             shutil.rmtree(root)
         except OSError:
@@ -283,7 +418,39 @@ def clean(flag_rollback, root):
 # ----------------------------------------------------------------------
 
 
-def main():
+def fast_parse(argv):
+    """
+    Parseo directo del caso común: carpeta + opciones exactas.
+
+    Devuelve None ante cualquier otra cosa (--help, abreviaturas,
+    --opción=valor, errores...) para que decida argparse.
+    """
+    args = SimpleNamespace(
+        folder=None, backend="setuptools", python=None, git=False, force=False
+    )
+    it = iter(argv)
+    for arg in it:
+        if arg in ("--git", "--force"):
+            setattr(args, arg[2:], True)
+        elif arg in ("--backend", "--python"):
+            value = next(it, None)
+            if value is None or value.startswith("-"):
+                return None
+            setattr(args, arg[2:], value)
+        elif arg.startswith("-") or args.folder is not None:
+            return None
+        else:
+            args.folder = arg
+
+    if args.folder is None or args.backend not in BACKENDS:
+        return None
+    return args
+
+
+def parse_args(argv):
+    """Parser completo con argparse (ayuda y mensajes de error)."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Bootstrap minimalista para proyectos Python",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -317,7 +484,12 @@ Ejemplos:
         "--force", action="store_true", help="Sobrescribir proyecto existente"
     )
 
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def main():
+    argv = sys.argv[1:]
+    args = fast_parse(argv) or parse_args(argv)
 
     # Preparación
     name = clean_name(args.folder)
@@ -325,19 +497,18 @@ Ejemplos:
     lock = root / LOCK_FILE
 
     # Validación: Carpeta limpia o --force
-    if root.exists() and any(root.iterdir()):
-        # Permitir si solo tiene lockfile
-        if lock.exists() and len(list(root.iterdir())) == 1:
-            pass
-        elif not args.force:
-            sys.exit(
-                f"❌ La carpeta '{root.name}' no está vacía.\n"
-                f"   Usa --force para sobrescribir."
-            )
-
-    if args.force and lock.exists():
-        lock.unlink()
-    elif lock.exists():
+    names = peek_dir(root)
+
+    # Permitir si solo tiene lockfile
+    if names and names != [LOCK_FILE] and not args.force:
+        sys.exit(
+            f"❌ La carpeta '{root.name}' no está vacía.\n"
+            f"   Usa --force para sobrescribir."
+        )
+
+    if args.force:
+        lock.unlink(missing_ok=True)
+    elif names:  # Aquí solo puede ser [LOCK_FILE]
         sys.exit("⚠️ El proyecto ya existe. Usa --force para regenerar.")
 
     # Detectar Python
@@ -345,30 +516,47 @@ Ejemplos:
 
     # Flag para rollback
     flag_rollback = not root.exists()
+    created = []
 
     try:
         print(f"✅ Creando proyecto '{name}' con backend '{args.backend}'...")
 
-        # Flujo principal
-        root.mkdir(exist_ok=True)
-        hardlink = create_venv(root, python_exe, args.python)
-        create_files(root, name, args.backend)
+        # Flujo principal (create_files crea también root)
+        create_files(root, name, args.backend, created)
 
         if args.git:
-            init_git(root)
+            # Import diferido: concurrent.futures (y logging) solo con --git
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Git solo necesita los archivos (.venv está en .gitignore):
+            # se ejecuta en paralelo mientras se crea el venv
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                git_job = executor.submit(init_git, root)
+                hardlink = create_venv(root, python_exe, args.python)
+                git_job.result()
+        else:
+            hardlink = create_venv(root, python_exe, args.python)
 
-        # Marcar como completado
-        lock.write_text("ok")
+        # Marcar como completado. O_EXCL: si el lock ya existe, otro deploy
+        # ha terminado en paralelo sobre la misma carpeta
+        try:
+            fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            sys.exit(f"⚠️ Otro deploy ha completado '{root.name}' a la vez. Revísalo.")
+        try:
+            os.write(fd, b"ok")
+        finally:
+            os.close(fd)
         show_next_steps(root, hardlink)
 
     except KeyboardInterrupt:
         print("❌ Cancelado por el usuario.")
-        clean(flag_rollback, root)
+        clean(flag_rollback, root, created)
         sys.exit(130)
 
     except Exception as e:
         print(f"❌ Error: {e}")
-        clean(flag_rollback, root)
+        clean(flag_rollback, root, created)
         sys.exit(1)
 
 